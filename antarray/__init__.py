@@ -33,7 +33,7 @@
 import numpy
 from scipy import signal
 
-from .antennaarray import AntennaArray
+from .antennaarray import AntennaArray, from_elements, to_db
 from .lineararray import LinearArray
 from .rectarray import RectArray
 __version__ = '1.0.5'
@@ -3,10 +3,19 @@
 """
     This script contains classes for an antenna array
 
+    This script requires that `numpy` and `scipy` be installed within
+    the Python environment you are running this script in.
+
     This file can be imported as a module and contains the following
-    class:
+    class and functions:
 
     * AntennaArray
+    * from_elements
+    * import_cupy
+    * cis
+    * to_db
+    * window_taps
+    * taylor
 
     ----------
     AntArray - Antenna Array Analysis Module
@@ -37,7 +46,11 @@
 
 """
 
+import functools
+import warnings
+
 import numpy as np
+from scipy import signal
 
 
 class AntennaArray:
@@ -54,6 +67,13 @@ class AntennaArray:
     y : 1-d array
         Locations of the antenna elements on y-axis
         (Normalized to wavelength)
+    kxy : 2-d array
+        Stacked phase constants of the antenna elements, `2*pi*[x, y]`,
+        with the shape of (2, size)
+    kx : 1-d array
+        Phase constants of the antenna elements on x-axis, `2*pi*x`
+    ky : 1-d array
+        Phase constants of the antenna elements on y-axis, `2*pi*y`
     """
 
     def __init__(self, x, y=0):
@@ -63,16 +83,24 @@ class AntennaArray:
         x : 1-d array
             Locations of the antenna elements on x-axis
             (Normalized to wavelength)
-        y : 1-d array, optional
+        y : 1-d array or float, optional
             Locations of the antenna elements on y-axis
-            (Normalized to wavelength), (default is 0)
+            (Normalized to wavelength), a scalar is broadcast to the shape
+            of `x` (default is 0)
         """
-        self.x = x
-        self.y = y
+        # keep the element locations as C-contiguous float64 so that the
+        # steering products and the BLAS calls never upcast or copy them
+        self.x = np.ascontiguousarray(np.atleast_1d(x), dtype=np.float64)
+        self.y = np.ascontiguousarray(np.broadcast_to(
+            np.asarray(y, dtype=np.float64), self.x.shape))
+        self.kxy = 2 * np.pi * np.stack((self.x, self.y))
+        self.kx, self.ky = self.kxy
 
     def get_pattern(self, azimuth,
                     elevation,
-                    weight=None):
+                    weight=None,
+                    dtype=complex,
+                    backend='numpy'):
         """
         Calculate the array factor
 
@@ -84,6 +112,16 @@ class AntennaArray:
             Elevation angles (deg)
         weight : 1-D array (complex), optional
             Weightings for array elements (default is None)
+        dtype : data-type, optional
+            Complex data type used for the calculation. `numpy.complex64`
+            halves the memory traffic at single precision
+            (default is `complex`)
+        backend : str, optional
+            Array backend, supports `numpy`, `numba`, and `cupy`. `numba`
+            runs a compiled kernel that never builds the steering matrix
+            and requires Numba, `cupy` evaluates the pattern on the GPU
+            and requires CuPy, falling back to `numpy` with a warning
+            when CuPy is not installed (default is `numpy`)
 
         Returns
         -------
@@ -95,20 +133,260 @@ class AntennaArray:
             Elevation angles
         """
 
+        real_dtype = np.finfo(dtype).dtype
+        u = np.sin(np.asarray(azimuth, dtype=real_dtype) / 180 * np.pi)
+        v = np.sin(np.asarray(elevation, dtype=real_dtype) / 180 * np.pi)
         size = len(self.x)
 
-        azimuth_grid, elevation_grid = np.meshgrid(azimuth, elevation)
-        u_grid = np.sin(azimuth_grid / 180 * np.pi)
-        v_grid = np.sin(elevation_grid/180*np.pi)
-
         if weight is None:
             weight = np.ones(size)
+        weight = np.asarray(weight, dtype=dtype)
+        # no copy at double precision
+        kxy = self.kxy.astype(real_dtype, copy=False)
+
+        if backend == 'cupy':
+            cp = import_cupy()
+            if cp is None:
+                backend = 'numpy'
+
+        if backend == 'cupy':
+            kxy = cp.asarray(kxy)
+            steering_az = cp.exp(
+                -1j * cp.outer(cp.asarray(u), kxy[0])).astype(
+                    dtype, copy=False)
+            steering_el = cp.exp(
+                -1j * cp.outer(cp.asarray(v), kxy[1])).astype(
+                    dtype, copy=False)
+
+            steering_az *= cp.asarray(weight)
+            AF = cp.matmul(steering_az, steering_el.T).get()
+
+        elif backend == 'numba':
+            from antarray.kernels import antenna_pattern
+
+            AF = np.empty((len(u), len(v)), dtype=dtype)
+            antenna_pattern(kxy, weight, u, v, AF)
+
+        elif backend == 'numpy':
+            # the phase of element i is -2*pi*(x_i*u_a + y_i*v_e), so its
+            # phasor factors into an azimuth term and an elevation term;
+            # the pattern is then one GEMM of the weighted
+            # (len(azimuth), size) azimuth phasors with the
+            # (size, len(elevation)) elevation phasors, and no phasor is
+            # evaluated on the full angle grid
+            steering_az = cis(np.multiply.outer(-u, kxy[0]), dtype=dtype)
+            steering_el = cis(np.multiply.outer(-v, kxy[1]), dtype=dtype)
+
+            steering_az *= weight
+            AF = np.matmul(steering_az, steering_el.T)
+
+        else:
+            raise ValueError('Unsupported backend: ' + str(backend))
+
+        return {'array_factor': AF}
+
+
+def from_elements(elements):
+    """
+    Create an antenna array from a list of element locations
+
+    Parameters
+    ----------
+    elements : 2-D array or list of (x, y)
+        Locations of the antenna elements, one `(x, y)` pair per element,
+        with the shape of (size, 2) (Normalized to wavelength)
+
+    Returns
+    -------
+    AntennaArray
+        Antenna array with the given element locations
+    """
+    xy = np.array(elements, dtype=float)
+    if xy.ndim != 2 or xy.shape[1] != 2:
+        raise ValueError(
+            'elements must have the shape of (size, 2), got ' +
+            str(xy.shape))
+    return AntennaArray(x=xy[:, 0], y=xy[:, 1])
+
+
+def import_cupy():
+    """
+    Import CuPy for the `cupy` backend
+
+    Returns
+    -------
+    module or None
+        The `cupy` module, or None with a warning when CuPy is not
+        installed, in which case the caller falls back to `numpy`
+    """
+    try:
+        import cupy
+    except ImportError:
+        warnings.warn('CuPy is not installed, falling back to the numpy '
+                      'backend')
+        return None
+    return cupy
+
+
+def cis(phase, dtype=complex, out=None):
+    """
+    Return the complex phasor `cos(phase) + 1j*sin(phase)`
+
+    The real and imaginary parts are written in place by the SIMD `cos`
+    and `sin` loops, which is cheaper than `np.exp(1j*phase)` and does
+    not allocate the complex `1j*phase` temporary
+
+    Parameters
+    ----------
+    phase : array
+        Phase (rad)
+    dtype : data-type, optional
+        Complex data type of the output (default is `complex`)
+    out : array (complex), optional
+        Output array with the same shape as `phase` (default is None)
+
+    Returns
+    -------
+    out : array (complex)
+        Complex phasor
+    """
+    if out is None:
+        out = np.empty(np.shape(phase), dtype=dtype)
+    np.cos(phase, out=out.real)
+    np.sin(phase, out=out.imag)
+    return out
+
+
+def to_db(array_factor, floor=1e-10):
+    """
+    Convert an array factor to decibels
+
+    The power is computed from the real and imaginary parts directly,
+    `10*log10(|AF|**2 + floor)`, which avoids the square root of
+    `20*log10(|AF| + eps)`
+
+    Parameters
+    ----------
+    array_factor : array (complex)
+        Array pattern in linear scale
+    floor : float, optional
+        Power floor added before the logarithm to avoid `log10(0)`
+        (default is 1e-10, i.e. -100 dB)
+
+    Returns
+    -------
+    out : array
+        Array pattern in decibels (dB)
+    """
+    array_factor = np.asarray(array_factor)
+    # a float ndarray, also for 0-d and integer input, so that the
+    # in-place updates below have an array to write to
+    power = np.array(array_factor.real, dtype=np.result_type(
+        array_factor.real.dtype, np.float32))
+    np.square(power, out=power)
+    power += np.square(array_factor.imag)
+    power += floor
+    np.log10(power, out=power)
+    power *= 10
+    return power
+
+
+@functools.lru_cache(maxsize=64)
+def window_taps(window, array_size, sll=-60, nbar=4):
+    """
+    Return the taps of a window function.
+    Results are cached, so repeated pattern updates with the same window
+    settings do not recompute the window.
+
+    Parameters
+    ----------
+    window : str
+        Window type, supports `Square`, `Chebyshev`, `Taylor`, `Hamming`,
+        and, `Hanning`
+    array_size : int
+        Number of points in the output window
+    sll : float, optional
+        Desired peak sidelobe level in decibels (dB) relative to
+        the mainlobe (Only works with Chebyshev window and Taylor window)
+        (default is -60)
+    nbar : int, optional
+        Number of nearly constant level sidelobes adjacent to the mainlobe
+        (Only works with Taylor window) (default is 4)
+
+    Returns
+    -------
+    out : 1-D array
+        Read-only window taps
+    """
+    if window == 'Square':
+        taps = np.ones(array_size)
+    elif window == 'Chebyshev':
+        taps = signal.windows.chebwin(array_size, at=-sll)
+    elif window == 'Taylor':
+        taps = taylor(array_size, nbar, sll)
+    elif window == 'Hamming':
+        taps = signal.windows.hamming(array_size)
+    elif window == 'Hanning':
+        taps = signal.windows.hann(array_size)
+    else:
+        raise ValueError('Unsupported window: ' + str(window))
+
+    taps.flags.writeable = False
+    return taps
+
+
+def taylor(N, nbar=4, level=-30):
+    """
+    Return the Taylor window.
+    The Taylor window allows for a selectable sidelobe suppression with a
+    minimum broadening. This window is commonly used in radar processing [1].
+
+    Parameters
+    ----------
+    M : int
+        Number of points in the output window. If zero or less, an
+        empty array is returned.
+    nbar : int
+        Number of nearly constant level sidelobes adjacent to the mainlobe
+    level : float
+        Desired peak sidelobe level in decibels (db) relative to the mainlobe
+
+    Returns
+    -------
+    out : array
+        The window, with the center value normalized to one (the value
+        one appears only if the number of samples is odd).
+
+    See Also
+    --------
+    kaiser, bartlett, blackman, hamming, hanning
+
+    References
+    -----
+    .. [1] W. Carrara, R. Goodman, and R. Majewski "Spotlight Synthetic
+               Aperture Radar: Signal Processing Algorithms" Pages 512-513,
+               July 1995.
+    """
+    B = 10**(-level / 20)
+    A = np.log(B + np.sqrt(B**2 - 1)) / np.pi
+    s2 = nbar**2 / (A**2 + (nbar - 0.5)**2)
+    ma = np.arange(1, nbar)
 
-        AF = np.zeros(np.shape(u_grid), dtype=complex)
+    # Fm for all m at once, rows are m and columns are j
+    m = ma[:, np.newaxis]
+    j = ma[np.newaxis, :]
+    numer = (-1)**(ma + 1) * np.prod(
+        1 - m**2 / s2 / (A**2 + (j - 0.5)**2), axis=1)
+    ratio = 1 - m**2 / j**2
+    np.fill_diagonal(ratio, 1)
+    denom = 2 * np.prod(ratio, axis=1)
+    Fm = numer / denom
 
-        for idx in range(0, size):
-            AF = AF + \
-                np.exp(-1j * 2 * np.pi *
-                       (self.x[idx]*u_grid + self.y[idx]*v_grid)) * weight[idx]
+    # evaluate the samples and the center point (N - 1) / 2 with a single
+    # cos matrix and GEMV
+    n = np.append(np.arange(N), (N - 1) / 2)
+    w = 2 * np.dot(Fm, np.cos(2 * np.pi * np.outer(
+        ma, n - N / 2 + 1 / 2) / N)) + 1
 
-        return {'array_factor': np.transpose(AF)}
+    # normalize (Note that this is not described in the original text [1])
+    return w[:-1] / w[-1]
@@ -0,0 +1,152 @@
+#!python
+"""
+    This script contains Numba kernels for antenna array patterns
+
+    This script requires that `numpy` and `numba` be installed within
+    the Python environment you are running this script in. It is only
+    imported when the `numba` backend is requested.
+
+    This file can be imported as a module and contains the following
+    functions:
+
+    * linear_pattern
+    * get_linear_pattern
+    * antenna_pattern
+
+    ----------
+    AntArray - Antenna Array Analysis Module
+    Copyright (C) 2018 - 2019  Zhengyu Peng
+    E-mail: zpeng.me@gmail.com
+    Website: https://zpeng.me
+
+    `                      `
+    -:.                  -#:
+    -//:.              -###:
+    -////:.          -#####:
+    -/:.://:.      -###++##:
+    ..   `://:-  -###+. :##:
+           `:/+####+.   :##:
+    .::::::::/+###.     :##:
+    .////-----+##:    `:###:
+     `-//:.   :##:  `:###/.
+       `-//:. :##:`:###/.
+         `-//:+######/.
+           `-/+####/.
+             `+##+.
+              :##:
+              :##:
+              :##:
+              :##:
+              :##:
+               .+:
+
+"""
+
+import math
+
+import numpy as np
+from numba import from_dtype, njit, prange, types
+
+# compiled linear_pattern entry points, keyed by complex data type
+LINEAR_PATTERN_CACHE = {}
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def linear_pattern(kx, weight, sin_theta, out):
+    """
+    Calculate the array factor of a linear array
+
+    The steering matrix is never materialized, every angle accumulates
+    its own weighted sum over the array elements
+
+    Parameters
+    ----------
+    kx : 1-D array
+        Phase constants of the antenna elements, `2*pi*x`
+    weight : 1-D array (complex)
+        Weightings for array elements
+    sin_theta : 1-D array
+        Sine of the angles for calculation
+    out : 1-D array (complex)
+        Output array factor, same length as `sin_theta`
+    """
+    for j in prange(sin_theta.shape[0]):
+        af_re = 0.0
+        af_im = 0.0
+        for i in range(kx.shape[0]):
+            phase = kx[i] * sin_theta[j]
+            c = math.cos(phase)
+            s = math.sin(phase)
+            af_re += weight[i].real * c - weight[i].imag * s
+            af_im += weight[i].real * s + weight[i].imag * c
+        out[j] = complex(af_re, af_im)
+
+
+def get_linear_pattern(dtype=complex):
+    """
+    Get `linear_pattern` compiled for a complex data type
+
+    The kernel is compiled once per data type with an explicit signature
+    and the entry point is reused by later calls, which skips the type
+    dispatch of the Numba dispatcher on every pattern update
+
+    Parameters
+    ----------
+    dtype : data-type, optional
+        Complex data type of the weights and the array factor
+        (default is `complex`)
+
+    Returns
+    -------
+    kernel : callable
+        `linear_pattern(kx, weight, sin_theta, out)` for C-contiguous
+        arrays, `sin_theta` read-only
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in LINEAR_PATTERN_CACHE:
+        real = types.Array(from_dtype(np.finfo(dtype).dtype), 1, 'C')
+        cplx = types.Array(from_dtype(dtype), 1, 'C')
+        LINEAR_PATTERN_CACHE[dtype] = linear_pattern.compile(
+            (real, cplx, real.copy(readonly=True), cplx))
+    return LINEAR_PATTERN_CACHE[dtype]
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def antenna_pattern(kxy, weight, u, v, out):
+    """
+    Calculate the array factor of an arbitrary array
+
+    Azimuth rows of the grid are computed in parallel
+
+    Parameters
+    ----------
+    kxy : 2-D array
+        Phase constants of the antenna elements, `2*pi*[x, y]`, with the
+        shape of (2, size)
+    weight : 1-D array (complex)
+        Weightings for array elements
+    u : 1-D array
+        Sine of the azimuth angles
+    v : 1-D array
+        Sine of the elevation angles
+    out : 2-D array (complex)
+        Output array factor, with the shape of (len(u), len(v))
+    """
+    # split the weights into real and imaginary planes so the element
+    # loop is a contiguous real FMA reduction that LLVM can vectorize
+    w_re = np.ascontiguousarray(weight.real)
+    w_im = np.ascontiguousarray(weight.imag)
+    kx = np.ascontiguousarray(kxy[0])
+    ky = np.ascontiguousarray(kxy[1])
+
+    for a in prange(u.shape[0]):
+        for e in range(v.shape[0]):
+            af_re = 0.0
+            af_im = 0.0
+            for i in range(kx.shape[0]):
+                phase = kx[i] * u[a] + ky[i] * v[e]
+                c = math.cos(phase)
+                s = math.sin(phase)
+                af_re += w_re[i] * c + w_im[i] * s
+                af_im += w_im[i] * c - w_re[i] * s
+            out[a, e] = complex(af_re, af_im)
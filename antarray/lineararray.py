@@ -7,9 +7,10 @@
     the Python environment you are running this script in.
 
     This file can be imported as a module and contains the following
-    class:
+    class and functions:
 
     * LinearArray
+    * cached_sin
 
     ----------
     AntArray - Antenna Array Analysis Module
@@ -40,9 +41,17 @@
 
 """
 
+import functools
+import math
+
 import numpy as np
 from scipy import signal
-from antarray.antarray import AntennaArray
+from antarray.antennaarray import AntennaArray, cis, import_cupy, window_taps
+# re-exported so that `antarray.lineararray.taylor` stays importable
+from antarray.antennaarray import taylor  # noqa: F401
+
+# maximum number of steering matrix entries evaluated at a time
+BLOCK_SIZE = 65536
 
 
 class LinearArray(AntennaArray):
@@ -100,7 +109,8 @@ class LinearArray(AntennaArray):
         self.__dict__.update((k, v) for k, v in kwargs.items() if k in keys)
         self.__init__(self.size, self.spacing)
 
-    def get_pattern(self, theta, beam_loc=0, window='Square', sll=-60, nbar=4):
+    def get_pattern(self, theta, beam_loc=0, window='Square', sll=-60, nbar=4,
+                    dtype=complex, backend='numpy'):
         """
         Calculate the array factor
 
@@ -120,6 +130,17 @@ class LinearArray(AntennaArray):
         nbar : int, optional
             Number of nearly constant level sidelobes adjacent to the mainlobe
             (Only works with Taylor window) (default is 4)
+        dtype : data-type, optional
+            Complex data type used for the calculation. `numpy.complex64`
+            halves the memory traffic at single precision
+            (default is `complex`)
+        backend : str, optional
+            Array backend for the steering matrix, supports `numpy`,
+            `numba`, and `cupy`. `numba` runs a parallel compiled kernel
+            that never builds the steering matrix and requires Numba,
+            `cupy` evaluates the steering matrix on the GPU and requires
+            CuPy, falling back to `numpy` with a warning when CuPy is not
+            installed (default is `numpy`)
 
         Returns
         -------
@@ -131,91 +152,141 @@ class LinearArray(AntennaArray):
         )
         """
 
-        weight = np.exp(-1j * 2 * np.pi * self.x * np.sin(
-            beam_loc / 180 * np.pi)) * self.window_dict[window](
-                self.size, sll, nbar)
+        taps = self.get_window(window, sll, nbar)
+        # steering phasors have unit magnitude, so sum(|weight|) is the
+        # sum of the window taps
+        weight = cis(self.kx * -math.sin(beam_loc / 180 * math.pi),
+                     dtype=dtype)
+        weight *= taps / np.sum(np.abs(taps))
+
+        real_dtype = np.finfo(dtype).dtype
+        sin_theta = cached_sin(
+            np.ravel(theta).astype(real_dtype, copy=False).tobytes(),
+            real_dtype)
+        # no copy at double precision
+        kx = self.kx.astype(real_dtype, copy=False)
+
+        if backend == 'cupy':
+            cp = import_cupy()
+            if cp is None:
+                backend = 'numpy'
+
+        if backend == 'cupy':
+            A = cp.exp(1j * cp.outer(
+                cp.asarray(kx), cp.asarray(sin_theta))).astype(
+                    dtype, copy=False)
+            AF = cp.matmul(cp.asarray(weight), A).get()
+
+        elif backend == 'numba':
+            from antarray.kernels import get_linear_pattern
+
+            AF = np.empty(len(sin_theta), dtype=dtype)
+            get_linear_pattern(dtype)(kx, weight, sin_theta, AF)
+
+        elif backend == 'numpy':
+            # the elements are uniformly spaced, so angles that are
+            # uniformly spaced in sin(theta) turn the array factor into a
+            # chirp-z transform of the weights
+            uniform = len(sin_theta) > 2 and np.allclose(
+                np.diff(sin_theta), sin_theta[1] - sin_theta[0],
+                rtol=1e-9, atol=0)
+
+            if uniform:
+                AF = signal.czt(
+                    weight, len(sin_theta),
+                    w=np.exp(1j * 2 * np.pi * self.spacing *
+                             (sin_theta[1] - sin_theta[0])),
+                    a=np.exp(-1j * 2 * np.pi * self.spacing *
+                             sin_theta[0])).astype(dtype)
+            else:
+                # evaluate the steering matrix in blocks of angles so that
+                # the full size x len(theta) matrix is never held in memory
+                block = max(1, BLOCK_SIZE // self.size)
+                phase = np.empty((self.size, min(block, len(sin_theta))),
+                                 dtype=real_dtype)
+                A = np.empty(np.shape(phase), dtype=dtype)
+
+                AF = np.empty(len(sin_theta), dtype=dtype)
+                for start in range(0, len(sin_theta), block):
+                    stop = min(start + block, len(sin_theta))
+                    ph = phase[:, :stop - start]
+                    a = A[:, :stop - start]
+                    np.multiply(kx[:, np.newaxis], sin_theta[start:stop],
+                                out=ph)
+                    cis(ph, out=a)
+                    np.matmul(weight, a, out=AF[start:stop])
+
+        else:
+            raise ValueError('Unsupported backend: ' + str(backend))
 
-        weight = weight / np.sum(np.abs(weight))
+        return {'array_factor': AF,
+                'weight': weight}
 
-        theta_grid, array_geometry_grid = np.meshgrid(
-            theta, self.x)
-        A = np.exp(1j * 2 * np.pi * array_geometry_grid * np.sin(
-            theta_grid / 180 * np.pi))
+    def get_window(self, window, sll=-60, nbar=4):
+        """
+        Get the window taps for the array elements
 
-        AF = np.matmul(weight, A)
+        The built-in windows are cached by `window_taps`, so repeated
+        calls with the same settings return the same read-only taps
 
-        return {'array_factor': AF,
-                'weight': weight}
+        Parameters
+        ----------
+        window : str
+            Window type, supports `Square`, `Chebyshev`, `Taylor`, `Hamming`,
+            and, `Hanning`
+        sll : float, optional
+            Desired peak sidelobe level in decibels (dB) relative to
+            the mainlobe (default is -60)
+        nbar : int, optional
+            Number of nearly constant level sidelobes adjacent to the mainlobe
+            (Only works with Taylor window) (default is 4)
+
+        Returns
+        -------
+        window : 1-D array
+            Read-only window taps
+        """
+
+        return self.window_dict[window](self.size, sll, nbar)
 
-    def square_win(self, *args, **kwargs):
-        return 1
+    def square_win(self, array_size, *args, **kwargs):
+        return window_taps('Square', array_size)
 
     def chebyshev_win(self, array_size, sll, *args, **kwargs):
-        return signal.chebwin(array_size, at=-sll)
+        return window_taps('Chebyshev', array_size, sll)
 
     def taylor_win(self, array_size, sll, nbar):
-        return taylor(array_size, nbar, sll)
+        return window_taps('Taylor', array_size, sll, nbar)
 
     def hamming_win(self, array_size, *args, **kwargs):
-        return signal.hamming(array_size)
+        return window_taps('Hamming', array_size)
 
     def hann_win(self, array_size, *args, **kwargs):
-        return signal.hann(array_size)
+        return window_taps('Hanning', array_size)
 
 
-def taylor(N, nbar=4, level=-30):
+@functools.lru_cache(maxsize=4)
+def cached_sin(theta, dtype):
     """
-    Return the Taylor window.
-    The Taylor window allows for a selectable sidelobe suppression with a
-    minimum broadening. This window is commonly used in radar processing [1].
+    Return the sine of angles in degrees.
+    Results are cached, so sweeping the same angles repeatedly only
+    evaluates the sine once. The cache keeps the raw bytes and the sine
+    of the last 4 sweeps alive for the lifetime of the process (about
+    16 MB per million float64 angles), `cached_sin.cache_clear()`
+    releases them.
 
     Parameters
     ----------
-    M : int
-        Number of points in the output window. If zero or less, an
-        empty array is returned.
-    nbar : int
-        Number of nearly constant level sidelobes adjacent to the mainlobe
-    level : float
-        Desired peak sidelobe level in decibels (db) relative to the mainlobe
+    theta : bytes
+        Raw bytes of a 1-D array of angles (deg)
+    dtype : data-type
+        Data type of the angles in `theta`
 
     Returns
     -------
-    out : array
-        The window, with the center value normalized to one (the value
-        one appears only if the number of samples is odd).
-
-    See Also
-    --------
-    kaiser, bartlett, blackman, hamming, hanning
-
-    References
-    -----
-    .. [1] W. Carrara, R. Goodman, and R. Majewski "Spotlight Synthetic
-               Aperture Radar: Signal Processing Algorithms" Pages 512-513,
-               July 1995.
+    out : 1-D array
+        Read-only sine of the angles
     """
-    B = 10**(-level / 20)
-    A = np.log(B + np.sqrt(B**2 - 1)) / np.pi
-    s2 = nbar**2 / (A**2 + (nbar - 0.5)**2)
-    ma = np.arange(1, nbar)
-
-    def calc_Fm(m):
-        numer = (-1)**(m + 1) * np.prod(1 - m**2 / s2 / (A**2 + (ma - 0.5)**2))
-        denom = 2 * np.prod([1 - m**2 / j**2 for j in ma if j != m])
-        return numer / denom
-
-    calc_Fm_vec = np.vectorize(calc_Fm)
-    Fm = calc_Fm_vec(ma)
-
-    def W(n):
-        return 2 * np.dot(Fm, np.cos(2 * np.pi * ma *
-                                     (n - N / 2 + 1 / 2) / N)) + 1
-
-    W_vec = np.vectorize(W)
-    w = W_vec(range(N))
-
-    # normalize (Note that this is not described in the original text [1])
-    scale = 1.0 / W((N - 1) / 2)
-    w *= scale
-    return w
+    sin_theta = np.sin(np.frombuffer(theta, dtype=dtype) / 180 * np.pi)
+    sin_theta.flags.writeable = False
+    return sin_theta
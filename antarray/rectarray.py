@@ -7,9 +7,10 @@
     the Python environment you are running this script in.
 
     This file can be imported as a module and contains the following
-    class:
+    class and function:
 
     * RectArray
+    * visible_region
 
     ----------
     AntArray - Antenna Array Analysis Module
@@ -40,9 +41,14 @@
 
 """
 
+import functools
+import math
+
 import numpy as np
-from scipy import signal
-from antarray.antarray import AntennaArray
+from scipy.fft import fft, next_fast_len
+from antarray.antennaarray import AntennaArray, cis, window_taps
+# re-exported so that `antarray.rectarray.taylor` stays importable
+from antarray.antennaarray import taylor  # noqa: F401
 
 
 class RectArray(AntennaArray):
@@ -133,18 +139,19 @@ class RectArray(AntennaArray):
                     slly=-60,
                     nbary=4,
                     plot_az=None,
-                    plot_el=None):
+                    plot_el=None,
+                    dtype=complex):
         """
         Calculate the array factor
 
         Parameters
         ----------
         nfft_az : int, optional
-            FFT points for azimuth beamforming.
-            Azimuth is the plane of x. (default is 512)
+            FFT points for azimuth beamforming, rounded up to the next
+            fast FFT size. Azimuth is the plane of x. (default is 512)
         nfft_el : int, optional
-            FFT points for elevation beamforming.
-            Elevation is the plane of y. (default is 512)
+            FFT points for elevation beamforming, rounded up to the next
+            fast FFT size. Elevation is the plane of y. (default is 512)
         beam_az : float, optional
             Angle of the main beam (deg) on azimuth. (default is 0)
         beam_el : float, optional
@@ -177,12 +184,18 @@ class RectArray(AntennaArray):
         plot_el : float, optional
             If `nfft_el == 1`, `plot_el` indicates the elevation angle of the
             returned azimuth pattern. (default `plot_el = beam_el`)
+        dtype : data-type, optional
+            Complex data type used for the calculation. `numpy.complex64`
+            halves the memory traffic of the FFT at single precision
+            (default is `complex`)
 
         Returns
         -------
         dict(
             'array_factor' : 1-D array or 2-D array
-                Antenna array pattern.
+                Antenna array pattern. The visible bins are taken from the
+                padded FFT, so a size such as `nfft_az=509` is sampled on
+                the `next_fast_len(509) = 512` point grid
             'x' : 1-D array
                 Horizontal locations of the array elements
             'y' : 1-D array
@@ -195,82 +208,71 @@ class RectArray(AntennaArray):
                 Corresponded elevation angles for `array_factor
         )
         """
-        y_grid, x_grid = np.meshgrid(self.y_array, self.x_array)
-
-        xy = np.ones((self.sizex, self.sizey), dtype=complex)
-
-        window = np.matmul(np.transpose(np.array([self.window_dict[windowx](
-            self.sizex, sllx, nbarx)])), np.array([self.window_dict[windowy](
-                self.sizey, slly, nbary)]))
-
-        weight = np.exp(1j * 2 * np.pi * (x_grid * np.sin(
-            beam_az / 180 * np.pi) + y_grid * np.sin(
-            beam_el/180*np.pi)))*window
-
-        weight = weight / np.sum(np.abs(weight))
-
-        tilex = int(np.ceil(self.spacingx-0.5))*2+1
-        k_az = 0.5*np.linspace(-tilex, tilex, nfft_az *
-                               tilex, endpoint=False)/self.spacingx
-        tiley = int(np.ceil(self.spacingy-0.5))*2+1
-        k_el = 0.5*np.linspace(-tiley, tiley, nfft_el *
-                               tiley, endpoint=False)/self.spacingy
-
-        if nfft_el <= 1 and nfft_az > 1:
-            A = np.fft.fftshift(np.fft.fft(xy*weight, nfft_az, axis=0), axes=0)
-            if plot_el is None:
-                plot_weight = np.array(
-                    [np.exp(-1j * 2 * np.pi * self.y_array * np.sin(
-                        beam_el / 180 * np.pi))])
-                elevation = np.array(beam_el)
-            else:
-                plot_weight = np.array(
-                    [np.exp(-1j * 2 * np.pi * self.y_array * np.sin(
-                        plot_el / 180 * np.pi))])
-                elevation = np.array(plot_el)
-            AF = np.matmul(A, np.transpose(plot_weight))[:, 0]
-            AF = np.tile(AF, tilex)
-            AF = AF[np.where(np.logical_and(
-                k_az >= -1, k_az <= 1))[0]]
-            k_az = k_az[np.where(np.logical_and(
-                k_az >= -1, k_az <= 1))[0]]
-            azimuth = np.arcsin(k_az)/np.pi*180
-
-        elif nfft_az <= 1 and nfft_el > 1:
-            A = np.fft.fftshift(np.fft.fft(xy*weight, nfft_el, axis=1), axes=1)
-            if plot_az is None:
-                plot_weight = np.array(
-                    [np.exp(-1j * 2 * np.pi * self.x_array * np.sin(
-                        beam_az / 180 * np.pi))])
-                azimuth = np.array(beam_az)
-            else:
-                plot_weight = np.array(
-                    [np.exp(-1j * 2 * np.pi * self.x_array * np.sin(
-                        plot_az / 180 * np.pi))])
-                azimuth = np.array(plot_az)
-
-            AF = np.matmul(np.transpose(A), np.transpose(plot_weight))[:, 0]
-            AF = np.tile(AF, tiley)
-            AF = AF[np.where(np.logical_and(
-                k_el >= -1, k_el <= 1))[0]]
-            k_el = k_el[np.where(np.logical_and(
-                k_el >= -1, k_el <= 1))[0]]
-            elevation = np.arcsin(k_el)/np.pi*180
-
-        elif nfft_el > 1 and nfft_az > 1:
-            AF = np.fft.fftshift(np.fft.fft2(xy*weight, (nfft_az, nfft_el)))
-            AF = np.tile(AF, (tilex, 1))
-            AF = np.tile(AF, (1, tiley))
-            AF = AF[np.where(np.logical_and(
-                k_az >= -1, k_az <= 1))[0], :]
-            AF = AF[:, np.where(np.logical_and(
-                k_el >= -1, k_el <= 1))[0]]
-            k_az = k_az[np.where(np.logical_and(
-                k_az >= -1, k_az <= 1))[0]]
-            k_el = k_el[np.where(np.logical_and(
-                k_el >= -1, k_el <= 1))[0]]
-            azimuth = np.arcsin(k_az)/np.pi*180
-            elevation = np.arcsin(k_el)/np.pi*180
+        # pad to sizes with only small prime factors, which pocketfft
+        # transforms fastest
+        nfft_az = next_fast_len(nfft_az)
+        nfft_el = next_fast_len(nfft_el)
+
+        # the steering phase x*sin(az) + y*sin(el) and the window are both
+        # separable, so the weights are the outer product of a steered and
+        # windowed x vector with a y vector; the steering phasors have unit
+        # magnitude, so sum(|weight|) is the product of the window tap sums
+        win_x = self.window_dict[windowx](self.sizex, sllx, nbarx)
+        win_y = self.window_dict[windowy](self.sizey, slly, nbary)
+
+        weight_x = cis(self.x_array * (
+            2 * np.pi * math.sin(beam_az / 180 * math.pi)), dtype=dtype)
+        weight_x *= win_x / np.sum(np.abs(win_x))
+        weight_y = cis(self.y_array * (
+            2 * np.pi * math.sin(beam_el / 180 * math.pi)), dtype=dtype)
+        weight_y *= win_y / np.sum(np.abs(win_y))
+
+        weight = np.outer(weight_x, weight_y)
+
+        plot_az = beam_az if plot_az is None else plot_az
+        plot_el = beam_el if plot_el is None else plot_el
+
+        # an axis with a single FFT point is a cut at plot_az / plot_el;
+        # the weighted sum along that axis commutes with the FFT along the
+        # other one, so collapse the weights before transforming
+        AF = weight
+        if nfft_az <= 1:
+            AF = np.matmul(cis(self.x_array * (
+                -2 * np.pi * math.sin(plot_az / 180 * math.pi)),
+                dtype=dtype), AF)
+            azimuth = np.array(plot_az)
+        if nfft_el <= 1:
+            AF = np.matmul(AF, cis(self.y_array * (
+                -2 * np.pi * math.sin(plot_el / 180 * math.pi)),
+                dtype=dtype))
+            elevation = np.array(plot_el)
+
+        # row-column FFT: transforming along x first only touches the
+        # sizey nonzero columns, so the zero padding along y is never
+        # transformed on the first pass
+        if nfft_az > 1:
+            AF = fft(AF, nfft_az, axis=0,
+                     overwrite_x=AF is not weight, workers=-1)
+        if nfft_el > 1:
+            AF = fft(AF, nfft_el, axis=-1,
+                     overwrite_x=AF is not weight, workers=-1)
+
+        # cropping with a slice returns a view that would keep the whole
+        # FFT buffer alive, so copy the visible bins out unless the last
+        # crop was an index array, which already copies
+        view = False
+        if nfft_az > 1:
+            az_idx, azimuth = visible_region(nfft_az, self.spacingx)
+            AF = AF[az_idx]
+            azimuth = azimuth.copy()
+            view = isinstance(az_idx, slice)
+        if nfft_el > 1:
+            el_idx, elevation = visible_region(nfft_el, self.spacingy)
+            AF = AF[..., el_idx]
+            elevation = elevation.copy()
+            view = isinstance(el_idx, slice)
+        if view:
+            AF = AF.copy()
 
         return {
             'array_factor': AF,
@@ -281,74 +283,67 @@ class RectArray(AntennaArray):
             'elevation': elevation}
 
     def square_win(self, array_size, *args, **kwargs):
-        return np.ones(array_size)
+        return window_taps('Square', array_size)
 
     def chebyshev_win(self, array_size, sll, *args, **kwargs):
-        return signal.chebwin(array_size, at=-sll)
+        return window_taps('Chebyshev', array_size, sll)
 
     def taylor_win(self, array_size, sll, nbar):
-        return taylor(array_size, nbar, sll)
+        return window_taps('Taylor', array_size, sll, nbar)
 
     def hamming_win(self, array_size, *args, **kwargs):
-        return signal.hamming(array_size)
+        return window_taps('Hamming', array_size)
 
     def hann_win(self, array_size, *args, **kwargs):
-        return signal.hann(array_size)
+        return window_taps('Hanning', array_size)
 
 
-def taylor(N, nbar=4, level=-30):
+@functools.lru_cache(maxsize=16)
+def visible_region(nfft, spacing):
     """
-    Return the Taylor window.
-    The Taylor window allows for a selectable sidelobe suppression with a
-    minimum broadening. This window is commonly used in radar processing [1].
+    Return the visible region of a FFT pattern.
+    With element spacing larger than half a wavelength, the FFT output is
+    periodically extended to cover the whole visible region `|k| <= 1`.
+    Results are cached, so the region is only searched once per
+    `(nfft, spacing)`.
 
     Parameters
     ----------
-    M : int
-        Number of points in the output window. If zero or less, an
-        empty array is returned.
-    nbar : int
-        Number of nearly constant level sidelobes adjacent to the mainlobe
-    level : float
-        Desired peak sidelobe level in decibels (db) relative to the mainlobe
+    nfft : int
+        FFT points
+    spacing : float
+        Spacing between antenna elements
+        (Normalized to wavelength)
 
     Returns
     -------
-    out : array
-        The window, with the center value normalized to one (the value
-        one appears only if the number of samples is odd).
-
-    See Also
-    --------
-    kaiser, bartlett, blackman, hamming, hanning
-
-    References
-    -----
-    .. [1] W. Carrara, R. Goodman, and R. Majewski "Spotlight Synthetic
-               Aperture Radar: Signal Processing Algorithms" Pages 512-513,
-               July 1995.
+    index : slice or 1-D array
+        Index of the visible bins into the unshifted FFT output (the
+        `fftshift` is folded into the index), a slice when the visible
+        bins are contiguous, otherwise read-only wrapped indices
+    angle : 1-D array
+        Read-only angles of the visible bins (deg)
     """
-    B = 10**(-level / 20)
-    A = np.log(B + np.sqrt(B**2 - 1)) / np.pi
-    s2 = nbar**2 / (A**2 + (nbar - 0.5)**2)
-    ma = np.arange(1, nbar)
-
-    def calc_Fm(m):
-        numer = (-1)**(m + 1) * np.prod(1 - m**2 / s2 / (A**2 + (ma - 0.5)**2))
-        denom = 2 * np.prod([1 - m**2 / j**2 for j in ma if j != m])
-        return numer / denom
-
-    calc_Fm_vec = np.vectorize(calc_Fm)
-    Fm = calc_Fm_vec(ma)
-
-    def W(n):
-        return 2 * np.dot(Fm, np.cos(2 * np.pi * ma *
-                                     (n - N / 2 + 1 / 2) / N)) + 1
-
-    W_vec = np.vectorize(W)
-    w = W_vec(range(N))
-
-    # normalize (Note that this is not described in the original text [1])
-    scale = 1.0 / W((N - 1) / 2)
-    w *= scale
-    return w
+    tile = int(np.ceil(spacing-0.5))*2+1
+    # bin j of the tiled fftshift output has the spatial frequency
+    # (j - tile//2*nfft - nfft//2)/nfft, which is also right for odd nfft
+    k = (np.arange(nfft*tile) - tile//2*nfft - nfft//2)/nfft/spacing
+
+    # k is sorted, so the visible region is one slice of the periodically
+    # extended FFT output
+    lo = np.searchsorted(k, -1)
+    hi = np.searchsorted(k, 1, side='right')
+
+    # bin i of the fftshift output is bin i - nfft//2 of the raw FFT
+    # output, so shifting the index saves the fftshift copy of the pattern
+    start = lo - nfft // 2
+    stop = hi - nfft // 2
+    if start // nfft == (stop - 1) // nfft:
+        index = slice(int(start % nfft), int(start % nfft + stop - start))
+    else:
+        index = np.arange(start, stop) % nfft
+        index.flags.writeable = False
+
+    angle = np.arcsin(k[lo:hi])/np.pi*180
+    angle.flags.writeable = False
+    return index, angle
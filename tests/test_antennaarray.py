@@ -1,5 +1,8 @@
-from antarray import AntennaArray
+from antarray import AntennaArray, LinearArray, from_elements, to_db
 import numpy as np
+import numpy.testing as npt
+import pytest
+import sys
 
 
 def test_antennaarray():
@@ -22,3 +25,117 @@ def test_antennaarray():
     assert np.max(np.abs(pattern_data['array_factor'])) == 1
     assert azimuth[peak_idx[0]] == 30
     assert elevation[peak_idx[1]] == 0
+
+
+def test_to_db():
+    print('#### Test to_db ####')
+    array_factor = np.array([1, 0.1j, -0.01, 0])
+    npt.assert_almost_equal(
+        to_db(array_factor), [0, -20, -40, -100], decimal=5)
+
+    # 0-d, scalar and integer inputs
+    npt.assert_almost_equal(to_db(np.array(0.1j)), -20, decimal=5)
+    npt.assert_almost_equal(to_db(0.01), -40, decimal=5)
+    npt.assert_almost_equal(to_db(np.array([1, 0])), [0, -100], decimal=5)
+
+
+def test_antennaarray_from_elements():
+    print('#### Test from_elements ####')
+    ant_array = from_elements([(0, 0), (0.5, 0), (0, 0.5)])
+    assert type(ant_array) is AntennaArray
+    assert np.array_equal(ant_array.x, [0, 0.5, 0])
+    assert np.array_equal(ant_array.y, [0, 0, 0.5])
+
+    assert not hasattr(LinearArray, 'from_elements')
+
+    # (2, size) and flat layouts are rejected, not reinterpreted
+    with pytest.raises(ValueError):
+        from_elements([[0, 1, 2, 3], [0, 0, 5, 5]])
+    with pytest.raises(ValueError):
+        from_elements([0, 0, 1, 0])
+
+
+def test_antennaarray_numba():
+    print('#### Test AntennaArray numba backend ####')
+    pytest.importorskip('numba')
+    x = np.array([0,  0.5, 1, 1.5,  0, 0.5, 1, 1.5])
+    y = np.array([0, 0,  0,  0,  0.5, 0.5, 0.5, 0.5])
+    ant_array = AntennaArray(x=x, y=y)
+
+    azimuth = np.arange(-90, 90, 1)
+    elevation = np.arange(-90, 90, 2)
+    weight = np.array([0.125, 0.125j, -0.125, -0.125j,
+                       0.125, 0.125j, -0.125, -0.125j])
+    pattern = ant_array.get_pattern(
+        azimuth=azimuth, elevation=elevation, weight=weight)
+    pattern_numba = ant_array.get_pattern(
+        azimuth=azimuth, elevation=elevation, weight=weight, backend='numba')
+    npt.assert_almost_equal(
+        pattern_numba['array_factor'], pattern['array_factor'])
+
+
+def test_antennaarray_cupy():
+    print('#### Test AntennaArray cupy backend ####')
+    pytest.importorskip('cupy')
+    x = np.array([0,  0.5, 1, 1.5,  0, 0.5, 1, 1.5])
+    y = np.array([0, 0,  0,  0,  0.5, 0.5, 0.5, 0.5])
+    ant_array = AntennaArray(x=x, y=y)
+
+    azimuth = np.arange(-90, 90, 1)
+    elevation = np.arange(-90, 90, 2)
+    weight = np.array([0.125, 0.125j, -0.125, -0.125j,
+                       0.125, 0.125j, -0.125, -0.125j])
+    pattern = ant_array.get_pattern(
+        azimuth=azimuth, elevation=elevation, weight=weight)
+    pattern_cupy = ant_array.get_pattern(
+        azimuth=azimuth, elevation=elevation, weight=weight, backend='cupy')
+    npt.assert_almost_equal(
+        pattern_cupy['array_factor'], pattern['array_factor'])
+
+
+def test_antennaarray_cupy_fallback(monkeypatch):
+    print('#### Test AntennaArray cupy fallback ####')
+    # a None entry makes `import cupy` raise ImportError
+    monkeypatch.setitem(sys.modules, 'cupy', None)
+    ant_array = AntennaArray(x=[0, 0.5, 1], y=[0, 0.5, 0])
+
+    azimuth = np.arange(-90, 90, 5)
+    elevation = np.arange(-90, 90, 10)
+    pattern = ant_array.get_pattern(azimuth=azimuth, elevation=elevation)
+    with pytest.warns(UserWarning, match='CuPy'):
+        pattern_cupy = ant_array.get_pattern(
+            azimuth=azimuth, elevation=elevation, backend='cupy')
+    npt.assert_almost_equal(
+        pattern_cupy['array_factor'], pattern['array_factor'])
+
+
+def test_antennaarray_single_precision():
+    print('#### Test AntennaArray complex64 ####')
+    x = np.array([0,  0.5, 1, 1.5,  0, 0.5, 1, 1.5])
+    y = np.array([0, 0,  0,  0,  0.5, 0.5, 0.5, 0.5])
+    ant_array = AntennaArray(x=x, y=y)
+
+    azimuth = np.arange(-90, 90, 1)
+    elevation = np.arange(-90, 90, 1)
+    weight = np.array([0.125, 0.125j, -0.125, -0.125j,
+                       0.125, 0.125j, -0.125, -0.125j])
+    pattern_data = ant_array.get_pattern(
+        azimuth=azimuth, elevation=elevation, weight=weight,
+        dtype=np.complex64)
+
+    peak_idx = np.unravel_index(np.argmax(
+        np.abs(pattern_data['array_factor'])),
+        np.shape(pattern_data['array_factor']))
+
+    assert pattern_data['array_factor'].dtype == np.complex64
+    assert azimuth[peak_idx[0]] == 30
+    assert elevation[peak_idx[1]] == 0
+
+
+def test_antennaarray_locations():
+    print('#### Test AntennaArray locations ####')
+    ant_array = AntennaArray(x=[0, 1, 2])
+    assert ant_array.x.dtype == np.float64
+    assert ant_array.x.flags['C_CONTIGUOUS']
+    assert ant_array.y.flags['C_CONTIGUOUS']
+    assert np.array_equal(ant_array.y, [0, 0, 0])
@@ -1,5 +1,8 @@
 from antarray import LinearArray
 import numpy as np
+import numpy.testing as npt
+import pytest
+import sys
 
 
 def test_lineararray():
@@ -17,3 +20,92 @@ def test_lineararray():
     pattern_data = lin_array.get_pattern(theta=theta, beam_loc=10)
     assert np.max(np.abs(pattern_data['array_factor'])) == 1
     assert theta[np.argmax(np.abs(pattern_data['array_factor']))] == 10
+
+
+def test_lineararray_single_precision():
+    print('#### Test LinearArray complex64 ####')
+    lin_array = LinearArray(size=16)
+
+    theta = np.arange(-90, 90, 1)
+    pattern_data = lin_array.get_pattern(
+        theta=theta, beam_loc=10, dtype=np.complex64)
+    assert pattern_data['array_factor'].dtype == np.complex64
+    assert pattern_data['weight'].dtype == np.complex64
+    assert theta[np.argmax(np.abs(pattern_data['array_factor']))] == 10
+
+
+def test_lineararray_window_cache():
+    print('#### Test LinearArray window cache ####')
+    lin_array = LinearArray(size=16)
+    taps = lin_array.get_window('Taylor', sll=-30, nbar=4)
+    assert taps is lin_array.get_window('Taylor', sll=-30, nbar=4)
+    assert not taps.flags.writeable
+
+    lin_array.update_parameters(size=8)
+    assert np.shape(lin_array.get_window('Taylor', sll=-30, nbar=4)) == (8,)
+
+
+def test_lineararray_numba():
+    print('#### Test LinearArray numba backend ####')
+    pytest.importorskip('numba')
+    lin_array = LinearArray(size=16)
+
+    theta = np.arange(-90, 90, 1)
+    pattern = lin_array.get_pattern(theta=theta, beam_loc=10)
+    pattern_numba = lin_array.get_pattern(
+        theta=theta, beam_loc=10, backend='numba')
+    npt.assert_almost_equal(
+        pattern_numba['array_factor'], pattern['array_factor'])
+
+
+def test_lineararray_cupy():
+    print('#### Test LinearArray cupy backend ####')
+    pytest.importorskip('cupy')
+    lin_array = LinearArray(size=16)
+
+    theta = np.arange(-90, 90, 1)
+    pattern = lin_array.get_pattern(theta=theta, beam_loc=10)
+    pattern_cupy = lin_array.get_pattern(
+        theta=theta, beam_loc=10, backend='cupy')
+    npt.assert_almost_equal(
+        pattern_cupy['array_factor'], pattern['array_factor'])
+
+
+def test_lineararray_cupy_fallback(monkeypatch):
+    print('#### Test LinearArray cupy fallback ####')
+    # a None entry makes `import cupy` raise ImportError
+    monkeypatch.setitem(sys.modules, 'cupy', None)
+    lin_array = LinearArray(size=16)
+
+    theta = np.arange(-90, 90, 1)
+    pattern = lin_array.get_pattern(theta=theta, beam_loc=10)
+    with pytest.warns(UserWarning, match='CuPy'):
+        pattern_cupy = lin_array.get_pattern(
+            theta=theta, beam_loc=10, backend='cupy')
+    npt.assert_almost_equal(
+        pattern_cupy['array_factor'], pattern['array_factor'])
+
+
+def test_lineararray_uniform_sine():
+    print('#### Test LinearArray uniform sin(theta) ####')
+    lin_array = LinearArray(size=64, spacing=0.7)
+
+    theta = np.arcsin(np.linspace(-1, 1, 1001))/np.pi*180
+    pattern_data = lin_array.get_pattern(
+        theta=theta, beam_loc=20, window='Taylor', sll=-40)
+    A = np.exp(1j * 2 * np.pi * lin_array.x[:, np.newaxis] *
+               np.sin(theta/180*np.pi))
+    npt.assert_almost_equal(pattern_data['array_factor'],
+                            np.matmul(pattern_data['weight'], A))
+
+
+def test_lineararray_windows():
+    print('#### Test LinearArray windows ####')
+    lin_array = LinearArray(size=16)
+
+    theta = np.arange(-90, 90, 1)
+    for window in ['Chebyshev', 'Taylor', 'Hamming', 'Hanning']:
+        pattern_data = lin_array.get_pattern(
+            theta=theta, beam_loc=-20, window=window, sll=-50)
+        npt.assert_almost_equal(np.sum(np.abs(pattern_data['weight'])), 1)
+        assert theta[np.argmax(np.abs(pattern_data['array_factor']))] == -20
@@ -1,6 +1,8 @@
 from antarray import RectArray
+from antarray.rectarray import taylor, visible_region
 import numpy as np
 import numpy.testing as npt
+from scipy.signal import windows
 
 
 def test_rectarray():
@@ -25,3 +27,113 @@ def test_rectarray():
     pattern_data = rect_array.get_pattern(beam_az=30)
     npt.assert_almost_equal(pattern_data['weight'], np.array(
         [0.125, 0.125j, -0.125, -0.125j, 0.125, 0.125j, -0.125, -0.125j]))
+
+
+def test_rectarray_single_precision():
+    print('#### Test RectArray complex64 ####')
+    rect_array = RectArray(sizex=4, sizey=2)
+    pattern_data = rect_array.get_pattern(beam_az=30, dtype=np.complex64)
+    assert pattern_data['array_factor'].dtype == np.complex64
+    npt.assert_almost_equal(pattern_data['weight'], np.array(
+        [0.125, 0.125j, -0.125, -0.125j, 0.125, 0.125j, -0.125, -0.125j]),
+        decimal=6)
+
+
+def steering_sum(rect_array, weight, azimuth, elevation):
+    # direct sum of the weighted steering phasors over all the elements,
+    # with the shape of (len(azimuth), len(elevation))
+    u = np.sin(np.radians(np.atleast_1d(azimuth)))[:, np.newaxis, np.newaxis]
+    v = np.sin(np.radians(np.atleast_1d(elevation)))[:, np.newaxis]
+    return np.sum(weight * np.exp(
+        -1j * 2 * np.pi * (rect_array.x * u + rect_array.y * v)), axis=-1)
+
+
+def test_rectarray_cuts():
+    print('#### Test RectArray cuts ####')
+    rect_array = RectArray(sizex=8, sizey=4, spacingx=0.5, spacingy=0.7)
+    settings = dict(beam_az=20, beam_el=-10, windowx='Chebyshev', sllx=-50,
+                    windowy='Hamming')
+
+    # azimuth cut at beam_el, and at an explicit plot_el
+    for plot_el in [None, 25]:
+        pattern_data = rect_array.get_pattern(
+            nfft_az=128, nfft_el=1, plot_el=plot_el, **settings)
+        elevation = -10 if plot_el is None else plot_el
+        assert pattern_data['elevation'] == elevation
+        npt.assert_allclose(pattern_data['array_factor'], steering_sum(
+            rect_array, pattern_data['weight'], pattern_data['azimuth'],
+            elevation)[:, 0], atol=1e-12)
+
+    # elevation cut at beam_az, and at an explicit plot_az
+    for plot_az in [None, -40]:
+        pattern_data = rect_array.get_pattern(
+            nfft_az=1, nfft_el=128, plot_az=plot_az, **settings)
+        azimuth = 20 if plot_az is None else plot_az
+        assert pattern_data['azimuth'] == azimuth
+        npt.assert_allclose(pattern_data['array_factor'], steering_sum(
+            rect_array, pattern_data['weight'], azimuth,
+            pattern_data['elevation'])[0], atol=1e-12)
+
+
+def test_rectarray_single_direction():
+    print('#### Test RectArray single direction ####')
+    rect_array = RectArray(sizex=8, sizey=4)
+    pattern_data = rect_array.get_pattern(
+        nfft_az=1, nfft_el=1, beam_az=20, plot_az=30, plot_el=-15)
+    assert np.shape(pattern_data['array_factor']) == ()
+    assert pattern_data['azimuth'] == 30
+    assert pattern_data['elevation'] == -15
+    npt.assert_allclose(pattern_data['array_factor'], steering_sum(
+        rect_array, pattern_data['weight'], 30, -15)[0, 0], atol=1e-12)
+
+
+def test_visible_region():
+    print('#### Test visible_region ####')
+    for nfft, spacing in [(75, 1.3), (75, 0.5), (64, 0.25), (64, 1.3)]:
+        # tile-and-mask reference on the fftshift output, whose bin j has
+        # the frequency fftshift(fftfreq(nfft))[j]
+        tile = int(np.ceil(spacing - 0.5)) * 2 + 1
+        k = (np.fft.fftshift(np.fft.fftfreq(nfft)) +
+             np.arange(-(tile // 2), tile // 2 + 1)[:, np.newaxis]
+             ).ravel() / spacing
+        mask = np.logical_and(k >= -1, k <= 1)
+        bins = np.arange(nfft)
+
+        index, angle = visible_region(nfft, spacing)
+        assert np.array_equal(
+            bins[index], np.tile(np.fft.fftshift(bins), tile)[mask])
+        npt.assert_allclose(angle, np.arcsin(k[mask]) / np.pi * 180)
+
+
+def test_rectarray_grating_lobes():
+    print('#### Test RectArray spacing > 0.5 ####')
+    for spacingx, spacingy in [(1.3, 0.25), (0.5, 0.5)]:
+        rect_array = RectArray(sizex=6, sizey=3,
+                               spacingx=spacingx, spacingy=spacingy)
+        pattern_data = rect_array.get_pattern(
+            nfft_az=75, nfft_el=64, beam_az=10)
+        array_factor = pattern_data['array_factor']
+        # the crop must not keep the full FFT buffer alive
+        assert array_factor.base is None or \
+            array_factor.base.size == array_factor.size
+        npt.assert_allclose(array_factor, steering_sum(
+            rect_array, pattern_data['weight'], pattern_data['azimuth'],
+            pattern_data['elevation']), atol=1e-12)
+
+
+def test_rectarray_fast_len():
+    print('#### Test RectArray FFT size rounding ####')
+    rect_array = RectArray(sizex=8, sizey=4)
+    pattern_data = rect_array.get_pattern(nfft_az=97, nfft_el=1)
+    padded_data = rect_array.get_pattern(nfft_az=98, nfft_el=1)
+    assert len(pattern_data['azimuth']) == 98
+    npt.assert_array_equal(pattern_data['azimuth'], padded_data['azimuth'])
+    npt.assert_allclose(pattern_data['array_factor'], steering_sum(
+        rect_array, pattern_data['weight'], pattern_data['azimuth'],
+        0)[:, 0], atol=1e-12)
+
+
+def test_taylor():
+    print('#### Test taylor ####')
+    npt.assert_allclose(taylor(16, 4, -30), windows.taylor(16, 4, 30))
+    npt.assert_allclose(taylor(15, 5, -40), windows.taylor(15, 5, 40))